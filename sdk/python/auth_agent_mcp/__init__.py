@@ -7,6 +7,16 @@ using Auth-Agent OAuth 2.1 authorization.
 
 from .middleware import AuthAgentMiddleware
 from .client import AuthAgentClient
+from .cache import TokenCache
+from .batch import BatchingIntrospector, BatchingIntrospectorClosed
+from .introspection import Introspection
 
 __version__ = "1.0.0"
-__all__ = ["AuthAgentMiddleware", "AuthAgentClient"]
+__all__ = [
+    "AuthAgentMiddleware",
+    "AuthAgentClient",
+    "TokenCache",
+    "BatchingIntrospector",
+    "BatchingIntrospectorClosed",
+    "Introspection",
+]
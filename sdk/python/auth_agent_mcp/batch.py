@@ -0,0 +1,193 @@
+"""
+Batched token introspection via the /introspect/batch endpoint
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import httpx
+import msgspec
+
+from .introspection import Introspection, decode_claims_batch, decode_introspection_batch
+
+# Largest batch the Auth-Agent server accepts per /introspect/batch call
+MAX_BATCH_SIZE = 100
+
+
+async def introspect_batch(
+    http: httpx.AsyncClient,
+    tokens: List[str],
+    headers: Optional[Dict[str, str]] = None,
+) -> List[Introspection]:
+    """
+    POST up to MAX_BATCH_SIZE tokens to /introspect/batch
+
+    Args:
+        http: Client whose base_url is the auth server
+        tokens: Access tokens to validate
+        headers: Extra request headers (e.g. the API key)
+
+    Returns:
+        One introspection result per token, in order
+
+    Raises:
+        httpx.HTTPStatusError: The server rejected the batch (e.g. 404 from
+            a server without the endpoint); no token's status is known
+        httpx.DecodingError: The response is malformed or has the wrong
+            number of results
+    """
+    response = await _post_batch(http, tokens, headers)
+
+    try:
+        results = decode_introspection_batch(response.content).results
+    except msgspec.DecodeError as e:
+        raise httpx.DecodingError(f"Malformed batch response: {e}", request=response.request) from e
+
+    _check_count(response, tokens, results)
+    return results
+
+
+async def introspect_batch_claims(
+    http: httpx.AsyncClient,
+    tokens: List[str],
+    headers: Optional[Dict[str, str]] = None,
+) -> List[Tuple[Introspection, Dict[str, Any]]]:
+    """
+    Like introspect_batch, but also return each result as the server sent it
+
+    Returns:
+        One (introspection result, response object) pair per token, in
+        order; the object keeps any fields Introspection does not declare
+
+    Raises:
+        The same errors as introspect_batch
+    """
+    response = await _post_batch(http, tokens, headers)
+
+    try:
+        claims = decode_claims_batch(response.content).results
+        results = [(msgspec.convert(c, Introspection), c) for c in claims]
+    except msgspec.DecodeError as e:
+        raise httpx.DecodingError(f"Malformed batch response: {e}", request=response.request) from e
+
+    _check_count(response, tokens, results)
+    return results
+
+
+async def _post_batch(
+    http: httpx.AsyncClient,
+    tokens: List[str],
+    headers: Optional[Dict[str, str]],
+) -> httpx.Response:
+    response = await http.post("/introspect/batch", headers=headers, json={"tokens": tokens})
+    response.raise_for_status()
+    return response
+
+
+def _check_count(response: httpx.Response, tokens: List[str], results: Sequence[Any]) -> None:
+    if len(results) != len(tokens):
+        raise httpx.DecodingError(
+            f"Expected {len(tokens)} introspection results, got {len(results)}",
+            request=response.request,
+        )
+
+
+class BatchingIntrospectorClosed(RuntimeError):
+    """Raised to callers whose tokens were still queued when the batcher closed."""
+
+
+class BatchingIntrospector:
+    """
+    Collect concurrent introspections into batched requests.
+
+    The first token queued opens a ``max_wait`` window (default 2 ms); every
+    token queued within it, up to ``max_batch``, goes out in one call to
+    ``introspect_many``. Each caller awaits only its own result.
+
+    This trades a little latency per lookup for far fewer requests when many
+    distinct tokens arrive together. It requires an auth server that
+    implements ``/introspect/batch``.
+
+    Example:
+        http = httpx.AsyncClient(base_url="https://mcp.auth-agent.com")
+        batcher = BatchingIntrospector(
+            lambda tokens: introspect_batch(http, tokens, {"Authorization": "Bearer sk_xyz789"})
+        )
+        token_data = await batcher.introspect("eyJhbG...")
+        if token_data.active:
+            ...
+    """
+
+    def __init__(
+        self,
+        introspect_many: Callable[[List[str]], Awaitable[List[Introspection]]],
+        max_batch: int = MAX_BATCH_SIZE,
+        max_wait: float = 0.002,
+    ):
+        self.introspect_many = introspect_many
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue: Optional["asyncio.Queue[Tuple[str, asyncio.Future]]"] = None
+        self._worker: Optional["asyncio.Task[None]"] = None
+        self._sending: Set["asyncio.Task[None]"] = set()
+
+    async def introspect(self, token: str) -> Introspection:
+        """Queue a token for the next batch and wait for its result."""
+        # Created lazily so the queue and worker belong to the running loop
+        if (
+            self._worker is None
+            or self._worker.done()
+            or self._worker.get_loop() is not asyncio.get_running_loop()
+        ):
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.ensure_future(self._run(self._queue))
+
+        future: "asyncio.Future[Introspection]" = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((token, future))  # type: ignore[union-attr]
+        return await future
+
+    async def aclose(self) -> None:
+        """Stop collecting batches; batches already sent still complete."""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+
+        while self._queue is not None and not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(BatchingIntrospectorClosed("BatchingIntrospector is closed"))
+
+    async def _run(self, queue: "asyncio.Queue[Tuple[str, asyncio.Future]]") -> None:
+        while True:
+            batch = [await queue.get()]
+            try:
+                await asyncio.sleep(self.max_wait)
+            except asyncio.CancelledError:
+                _, future = batch[0]
+                future.set_exception(BatchingIntrospectorClosed("BatchingIntrospector is closed"))
+                raise
+
+            while len(batch) < self.max_batch and not queue.empty():
+                batch.append(queue.get_nowait())
+
+            # Send in the background so the next window opens immediately
+            task = asyncio.ensure_future(self._send(batch))
+            self._sending.add(task)
+            task.add_done_callback(self._sending.discard)
+
+    async def _send(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        try:
+            results = await self.introspect_many([token for token, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(
+                    f"Expected {len(batch)} introspection results, got {len(results)}"
+                )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), token_data in zip(batch, results):
+            if not future.done():
+                future.set_result(token_data)
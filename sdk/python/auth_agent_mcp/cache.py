@@ -0,0 +1,127 @@
+"""
+In-process TTL cache for token introspection results
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Union
+
+from .introspection import INACTIVE, Introspection
+
+# (expires_at, stored_at, token_data, claims)
+_Entry = Tuple[float, float, Introspection, Optional[Dict[str, Any]]]
+
+
+class TokenCache:
+    """
+    Bounded LRU cache of introspection results, keyed by SHA-256 of the token.
+
+    Entries live until the token's own ``exp`` or ``ttl_seconds``, whichever
+    comes first. Tokens reported inactive are cached as ``INACTIVE``
+    for the shorter ``invalid_ttl_seconds``, long enough to blunt replayed bad
+    tokens and short enough for newly issued tokens to recover quickly.
+    Raw tokens are never stored, and keys are stable across processes
+    (unlike Python's randomized ``hash()``). An entry may also keep the
+    response's full claims, for callers that return them verbatim.
+
+    Example:
+        cache = TokenCache(ttl_seconds=30, max_size=10000)
+
+        client = AuthAgentClient(api_key="sk_xyz789", token_cache=cache)
+        app.add_middleware(AuthAgentMiddleware, api_key="sk_xyz789", token_cache=cache)
+
+        # Revoking through the client also drops the middleware's cached entry
+        await client.revoke_token(token)
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 30.0,
+        max_size: int = 10000,
+        invalid_ttl_seconds: float = 10.0,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.invalid_ttl_seconds = invalid_ttl_seconds
+        self._entries: "OrderedDict[bytes, _Entry]" = OrderedDict()
+
+    @staticmethod
+    def key(token: Union[str, bytes]) -> bytes:
+        """Return the cache key for a raw token (str or ASCII bytes)."""
+        if isinstance(token, str):
+            token = token.encode()
+        return hashlib.sha256(token).digest()
+
+    def get(self, key: bytes) -> Optional[Introspection]:
+        """Return the cached introspection result, or None on miss/expiry."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, _, token_data, _ = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return token_data
+
+    def age(self, key: bytes) -> Optional[float]:
+        """Return seconds since the entry was cached, or None if absent."""
+        entry = self._entries.get(key)
+        return None if entry is None else time.monotonic() - entry[1]
+
+    def claims(self, key: bytes) -> Optional[Dict[str, Any]]:
+        """Return the claims stored with the entry, or None if absent."""
+        entry = self._entries.get(key)
+        return None if entry is None else entry[3]
+
+    def put(
+        self,
+        key: bytes,
+        token_data: Introspection,
+        claims: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Cache an active introspection result until min(exp, ttl_seconds)."""
+        ttl = self.ttl_seconds
+        if token_data.exp is not None:
+            ttl = min(token_data.exp - time.time(), ttl)
+
+        self._set(key, token_data, ttl, claims)
+
+    def put_invalid(self, key: bytes, claims: Optional[Dict[str, Any]] = None) -> None:
+        """Cache an inactive token for ``invalid_ttl_seconds``."""
+        self._set(key, INACTIVE, self.invalid_ttl_seconds, claims)
+
+    def pop(self, key: bytes) -> None:
+        """Drop a single entry, if present."""
+        self._entries.pop(key, None)
+
+    def invalidate(self, token: str) -> None:
+        """Drop the cached result for a raw token, e.g. after revocation."""
+        self.pop(self.key(token))
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _set(
+        self,
+        key: bytes,
+        token_data: Introspection,
+        ttl: float,
+        claims: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        if ttl <= 0 or self.max_size <= 0:
+            return
+
+        now = time.monotonic()
+        self._entries[key] = (now + ttl, now, token_data, claims)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
@@ -2,8 +2,37 @@
 Auth-Agent client for manual token validation
 """
 
+import asyncio
+import os
+
 import httpx
-from typing import Optional, Dict, Any
+import msgspec
+from typing import Optional, Dict, Any, List
+
+from .batch import MAX_BATCH_SIZE, introspect_batch_claims
+from .cache import TokenCache
+from .introspection import INACTIVE, Introspection
+from .revocation import RedisRevocation
+
+# Set once per client so httpx doesn't rebuild timeouts per call. The short
+# pool timeout fails fast when every pooled connection is busy instead of
+# queueing requests behind an exhausted pool.
+DEFAULT_TIMEOUT = httpx.Timeout(5.0, connect=1.0, pool=1.0)
+
+
+def default_pool_limits() -> httpx.Limits:
+    """
+    Connection pool limits sized to the host's CPU count
+
+    ``keepalive_expiry`` must exceed the auth server's idle timeout, or idle
+    connections are dropped before they can be reused.
+    """
+    cpus = os.cpu_count() or 1
+    return httpx.Limits(
+        max_keepalive_connections=max(64, cpus * 8),
+        max_connections=max(256, cpus * 32),
+        keepalive_expiry=60.0,
+    )
 
 
 class AuthAgentClient:
@@ -19,17 +48,97 @@ class AuthAgentClient:
         result = await client.introspect_token("eyJhbG...")
         if result["active"]:
             print(f"Token valid for user: {result['sub']}")
+
+        await client.aclose()
+
+    Connections to the auth server are pooled (HTTP/2, keep-alive) for the
+    lifetime of the client; use it as ``async with AuthAgentClient(...)`` or
+    call ``aclose()`` when done. Connections belong to one event loop: a
+    client used from another loop (e.g. a later ``asyncio.run``) opens a
+    fresh pool there, and ``aclose()`` must run on the loop in use. Size the pool with ``pool_limits`` to match
+    the expected number of concurrent introspections.
+
+    Active introspection results are cached for up to ``cache_ttl_seconds``,
+    tokens the server reports inactive for ``negative_cache_ttl_seconds``.
+    Share ``token_cache`` with ``AuthAgentMiddleware`` so that ``invalidate``
+    and ``revoke_token`` take effect there immediately, or pass ``redis_url``
+    to broadcast revocations to middleware in other processes.
     """
 
+    __slots__ = (
+        "auth_server",
+        "api_key",
+        "_api_key_header",
+        "introspect_url",
+        "revoke_url",
+        "_cache",
+        "_pool_limits",
+        "_http",
+        "_http_loop",
+        "_revocation",
+    )
+
     def __init__(
         self,
         auth_server: str = "https://mcp.auth-agent.com",
         api_key: Optional[str] = None,
+        cache_ttl_seconds: float = 30.0,
+        cache_max: int = 10000,
+        negative_cache_ttl_seconds: float = 10.0,
+        token_cache: Optional[TokenCache] = None,
+        pool_limits: Optional[httpx.Limits] = None,
+        redis_url: Optional[str] = None,
     ):
         self.auth_server = auth_server.rstrip('/')
         self.api_key = api_key
+        # Built once and passed only to introspection calls, not set as a
+        # client default, so the key is never sent with /revoke or metadata
+        self._api_key_header = {"Authorization": f"Bearer {api_key}"} if api_key else {}
         self.introspect_url = f"{self.auth_server}/introspect"
         self.revoke_url = f"{self.auth_server}/revoke"
+        self._cache = token_cache or TokenCache(
+            cache_ttl_seconds, cache_max, negative_cache_ttl_seconds
+        )
+        self._pool_limits = pool_limits or default_pool_limits()
+        # Opened on first use, inside the event loop it is tied to
+        self._http: Optional[httpx.AsyncClient] = None
+        self._http_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._revocation = RedisRevocation(redis_url) if redis_url else None
+
+    async def __aenter__(self) -> "AuthAgentClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client and Redis connection"""
+        if self._revocation is not None:
+            await self._revocation.aclose()
+        if self._http is not None:
+            await self._http.aclose()
+
+    def _client(self) -> httpx.AsyncClient:
+        """Return the pooled client, reopening it after aclose() or on a new event loop"""
+        loop = asyncio.get_running_loop()
+        if self._http is None or self._http.is_closed or loop is not self._http_loop:
+            self._http = httpx.AsyncClient(
+                base_url=self.auth_server,
+                http2=True,
+                timeout=DEFAULT_TIMEOUT,
+                limits=self._pool_limits,
+            )
+            self._http_loop = loop
+        return self._http
+
+    def invalidate(self, token: str) -> None:
+        """
+        Drop any cached introspection result for a token
+
+        Args:
+            token: The access token to forget
+        """
+        self._cache.invalidate(token)
 
     async def introspect_token(self, token: str) -> Dict[str, Any]:
         """
@@ -39,7 +148,8 @@ class AuthAgentClient:
             token: The access token to validate
 
         Returns:
-            Dict containing token info:
+            The auth server's response body, including any fields beyond
+            these:
             {
                 "active": bool,
                 "sub": str,  # user email
@@ -50,18 +160,49 @@ class AuthAgentClient:
                 "iat": int
             }
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.introspect_url,
-                headers={"Authorization": f"Bearer {self.api_key}"},
-                json={"token": token},
-                timeout=5.0,
+        cache_key = TokenCache.key(token)
+        cached = self._cached(cache_key)
+        if cached is not None:
+            return cached
+
+        return await self._fetch_token_data(cache_key, token)
+
+    async def introspect_tokens(self, tokens: List[str]) -> List[Dict[str, Any]]:
+        """
+        Introspect many access tokens with as few requests as possible
+
+        Cached results are reused; the rest are sent to the auth server's
+        /introspect/batch endpoint in chunks of up to 100 tokens.
+
+        Args:
+            tokens: The access tokens to validate
+
+        Returns:
+            One dict per token, in order, shaped like introspect_token()
+
+        Raises:
+            httpx.HTTPError: A batch request failed; none of its tokens are cached
+        """
+        keys = [TokenCache.key(token) for token in tokens]
+        results: List[Optional[Dict[str, Any]]] = [self._cached(key) for key in keys]
+        misses = [i for i, cached in enumerate(results) if cached is None]
+
+        for start in range(0, len(misses), MAX_BATCH_SIZE):
+            chunk = misses[start:start + MAX_BATCH_SIZE]
+            fetched = await introspect_batch_claims(
+                self._client(),
+                [tokens[i] for i in chunk],
+                headers=self._api_key_header,
             )
 
-            if response.status_code != 200:
-                return {"active": False}
+            for i, (token_data, claims) in zip(chunk, fetched):
+                if token_data.active:
+                    self._cache.put(keys[i], token_data, claims)
+                else:
+                    self._cache.put_invalid(keys[i], claims)
+                results[i] = dict(claims)
 
-            return response.json()
+        return results  # type: ignore[return-value]
 
     async def revoke_token(
         self,
@@ -80,18 +221,24 @@ class AuthAgentClient:
         Returns:
             True if successful
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.revoke_url,
-                json={
-                    "token": token,
-                    "client_id": client_id,
-                    "client_secret": client_secret,
-                },
-                timeout=5.0,
-            )
+        response = await self._client().post(
+            "/revoke",
+            json={
+                "token": token,
+                "client_id": client_id,
+                "client_secret": client_secret,
+            },
+        )
 
-            return response.status_code == 200
+        self.invalidate(token)
+
+        if response.status_code != 200:
+            return False
+
+        if self._revocation is not None:
+            await self._revocation.publish(token)
+
+        return True
 
     async def get_server_metadata(self, server_id: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -103,11 +250,44 @@ class AuthAgentClient:
         Returns:
             Dict containing resource metadata
         """
-        url = f"{self.auth_server}/.well-known/oauth-protected-resource"
+        path = "/.well-known/oauth-protected-resource"
         if server_id:
-            url += f"/{server_id}"
+            path += f"/{server_id}"
+
+        response = await self._client().get(path)
+        response.raise_for_status()
+        return response.json()
+
+    def _cached(self, cache_key: bytes) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached response body, or None on miss"""
+        token_data = self._cache.get(cache_key)
+        if token_data is None:
+            return None
+
+        return dict(self._cache.claims(cache_key) or token_data.to_dict())
+
+    async def _fetch_token_data(self, cache_key: bytes, token: str) -> Dict[str, Any]:
+        """POST the token to /introspect, cache the result and return the body"""
+        response = await self._client().post(
+            "/introspect",
+            headers=self._api_key_header,
+            json={"token": token},
+        )
+
+        # Not cached: an error status says nothing about the token itself
+        if response.status_code != 200:
+            return INACTIVE.to_dict()
+
+        # Malformed bodies are treated like an error status: inactive, not cached
+        try:
+            claims = msgspec.json.decode(response.content)
+            token_data = msgspec.convert(claims, Introspection)
+        except msgspec.DecodeError:
+            return INACTIVE.to_dict()
+
+        if token_data.active:
+            self._cache.put(cache_key, token_data, claims)
+        else:
+            self._cache.put_invalid(cache_key, claims)
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, timeout=5.0)
-            response.raise_for_status()
-            return response.json()
+        return dict(claims)
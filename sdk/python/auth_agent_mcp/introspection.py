@@ -0,0 +1,54 @@
+"""
+Typed token introspection results (RFC 7662)
+"""
+
+from typing import Any, Dict, List, Optional, Union
+
+import msgspec
+
+
+class Introspection(msgspec.Struct, frozen=True, omit_defaults=True):
+    """
+    Introspection response, decoded straight from JSON by msgspec.
+
+    Declares the RFC 7662 response fields; any others are ignored. Every
+    field is optional and timestamps may be fractional, since servers
+    differ in what they send. Frozen so one instance can be shared safely
+    between cache entries and concurrent requests.
+    """
+
+    active: bool = False
+    sub: Optional[str] = None  # user email
+    client_id: Optional[str] = None
+    username: Optional[str] = None
+    token_type: Optional[str] = None
+    scope: Optional[str] = None  # space-separated; None means no scopes
+    aud: Union[str, List[str], None] = None  # audience/resource
+    iss: Optional[str] = None
+    jti: Optional[str] = None
+    exp: Union[int, float, None] = None
+    iat: Union[int, float, None] = None
+    nbf: Union[int, float, None] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return ``active`` plus the other fields present, as a plain dict."""
+        return {"active": self.active, **msgspec.to_builtins(self)}
+
+
+class IntrospectionBatch(msgspec.Struct, frozen=True):
+    """Response body of /introspect/batch."""
+
+    results: List[Introspection] = []
+
+
+class ClaimsBatch(msgspec.Struct, frozen=True):
+    """Response body of /introspect/batch, each result kept as a plain dict."""
+
+    results: List[Dict[str, Any]] = []
+
+
+INACTIVE = Introspection(active=False)
+
+decode_introspection = msgspec.json.Decoder(Introspection).decode
+decode_introspection_batch = msgspec.json.Decoder(IntrospectionBatch).decode
+decode_claims_batch = msgspec.json.Decoder(ClaimsBatch).decode
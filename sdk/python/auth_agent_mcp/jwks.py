@@ -0,0 +1,163 @@
+"""
+Local JWT verification against an auth server's JWKS
+"""
+
+import asyncio
+import time
+from typing import Any, Callable, Dict, Optional, Sequence
+
+import httpx
+
+from .introspection import Introspection
+
+try:
+    import jwt
+except ImportError:  # pragma: no cover - optional dependency
+    jwt = None  # type: ignore[assignment]
+
+
+class JWKSVerifier:
+    """
+    Verify JWT access tokens in-process using keys published at a JWKS URL.
+
+    Keys are fetched on first use, refreshed every ``refresh_interval``
+    seconds, and refetched early when a token names an unknown ``kid``
+    (at most once per ``min_refresh_interval`` so forged ``kid`` values
+    cannot hammer the auth server).
+
+    ``verify`` returns an ``Introspection`` like the endpoint would, or None
+    when the token cannot be verified locally, in which case callers should
+    fall back to introspection. Local verification does not see server-side
+    revocation; a revoked token stays valid until its ``exp``.
+
+    ``http`` is a zero-argument callable returning the client to fetch keys
+    with, so an owner that reopens its client after closing it is followed.
+
+    Requires the ``jwt`` extra: ``pip install auth-agent-mcp[jwt]``.
+    """
+
+    def __init__(
+        self,
+        http: Callable[[], httpx.AsyncClient],
+        jwks_url: str,
+        issuer: Optional[str] = None,
+        audience: Optional[str] = None,
+        algorithms: Sequence[str] = ("RS256", "ES256"),
+        refresh_interval: float = 600.0,
+        min_refresh_interval: float = 30.0,
+    ):
+        if jwt is None:
+            raise ImportError(
+                "Local JWT verification requires PyJWT: "
+                "pip install auth-agent-mcp[jwt]"
+            )
+
+        self.jwks_url = jwks_url
+        self.issuer = issuer
+        self.audience = audience
+        self.algorithms = list(algorithms)
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self._http = http
+        self._keys: Dict[Optional[str], Any] = {}
+        self._fetched_at: Optional[float] = None
+        self._refresh_task: Optional["asyncio.Task[None]"] = None
+
+    async def verify(self, token: str) -> Optional[Introspection]:
+        """
+        Verify a JWT's signature, exp, aud and iss.
+
+        Args:
+            token: The raw JWT
+
+        Returns:
+            Introspection result for a valid token, otherwise None
+        """
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.PyJWTError:
+            return None
+
+        key = await self._get_key(header.get("kid"))
+        if key is None:
+            return None
+
+        try:
+            claims = jwt.decode(
+                token,
+                key,
+                algorithms=self.algorithms,
+                audience=self.audience,
+                issuer=self.issuer,
+                options={"verify_aud": self.audience is not None},
+            )
+        except jwt.PyJWTError:
+            return None
+
+        # RFC 8693 uses a space-separated string; some issuers emit a list
+        scope = claims.get("scope", "")
+        if isinstance(scope, list):
+            scope = " ".join(s for s in scope if isinstance(s, str))
+        elif not isinstance(scope, str):
+            scope = ""
+
+        return Introspection(
+            active=True,
+            sub=claims.get("sub"),
+            client_id=claims.get("client_id"),
+            scope=scope,
+            aud=claims.get("aud"),
+            exp=claims.get("exp"),
+            iat=claims.get("iat"),
+        )
+
+    async def _get_key(self, kid: Optional[str]) -> Any:
+        now = time.monotonic()
+        age = None if self._fetched_at is None else now - self._fetched_at
+
+        if age is None or age > self.refresh_interval or (
+            kid not in self._keys and age > self.min_refresh_interval
+        ):
+            await self._refresh()
+
+        if kid is None and len(self._keys) == 1:
+            return next(iter(self._keys.values()))
+
+        return self._keys.get(kid)
+
+    async def _refresh(self) -> None:
+        # Concurrent callers share one fetch
+        if (
+            self._refresh_task is None
+            or self._refresh_task.done()
+            or self._refresh_task.get_loop() is not asyncio.get_running_loop()
+        ):
+            self._refresh_task = asyncio.ensure_future(self._fetch_keys())
+
+        await asyncio.shield(self._refresh_task)
+
+    async def _fetch_keys(self) -> None:
+        # Record the attempt even on failure so outages don't trigger a
+        # fetch per request; existing keys stay in use until the next refresh.
+        self._fetched_at = time.monotonic()
+
+        try:
+            response = await self._http().get(self.jwks_url)
+            response.raise_for_status()
+            jwks = response.json()
+        except (httpx.HTTPError, ValueError):
+            return
+
+        if not isinstance(jwks, dict) or not isinstance(jwks.get("keys"), list):
+            return
+
+        keys: Dict[Optional[str], Any] = {}
+        for jwk in jwks["keys"]:
+            if not isinstance(jwk, dict):
+                continue
+            try:
+                keys[jwk.get("kid")] = jwt.PyJWK(jwk).key
+            except jwt.PyJWTError:
+                continue
+
+        self._keys = keys
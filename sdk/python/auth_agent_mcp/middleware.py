@@ -2,17 +2,56 @@
 FastAPI middleware for Auth-Agent MCP authentication
 """
 
+import asyncio
+import re
 import httpx
-from typing import List, Optional
-from fastapi import Request, HTTPException
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+import msgspec
+from typing import Any, Dict, List, Optional, Tuple
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from .batch import BatchingIntrospector, BatchingIntrospectorClosed, introspect_batch
+from .cache import TokenCache
+from .client import DEFAULT_TIMEOUT, default_pool_limits
+from .introspection import INACTIVE, Introspection, decode_introspection
+from .jwks import JWKSVerifier
+from .revocation import RedisRevocation
 
-class AuthAgentMiddleware(BaseHTTPMiddleware):
+# Longer bearer values are rejected without contacting the auth server
+MAX_TOKEN_LENGTH = 4096
+
+# RFC 6750 b64token. Also guarantees the token can be spliced into a JSON body.
+_B64TOKEN = re.compile(rb"[A-Za-z0-9\-._~+/]+=*")
+
+# (status, raw ASGI headers, body) for a response sent instead of the app
+Rejection = Tuple[int, List[Tuple[bytes, bytes]], bytes]
+
+
+def _json_rejection(
+    status: int,
+    content: Dict[str, Any],
+    www_authenticate: Optional[str] = None,
+) -> Rejection:
+    """Render a JSON error response to raw ASGI headers and body bytes."""
+    body = msgspec.json.encode(content)
+    headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode()),
+    ]
+    if www_authenticate:
+        headers.append((b"www-authenticate", www_authenticate.encode()))
+
+    return status, headers, body
+
+
+class AuthAgentMiddleware:
     """
     Middleware to validate Auth-Agent access tokens for MCP servers.
 
+    Implemented as plain ASGI middleware (no ``BaseHTTPMiddleware`` task group
+    or stream copying). The authenticated user's context is available to
+    handlers as ``request.state.user_email``, ``scopes``, ``client_id`` and
+    ``audience``.
+
     Example:
         from fastapi import FastAPI
         from auth_agent_mcp import AuthAgentMiddleware
@@ -25,78 +64,337 @@ class AuthAgentMiddleware(BaseHTTPMiddleware):
             api_key="sk_xyz789",
             required_scopes=["files:read"]
         )
+
+    Active introspection results are cached in-process for up to
+    ``cache_ttl_seconds`` (never past the token's ``exp``). Pass a shared
+    ``token_cache`` to let an ``AuthAgentClient`` invalidate entries on
+    revocation, or ``cache_ttl_seconds=0`` to disable caching. Tokens the
+    server reports inactive are remembered for ``negative_cache_ttl_seconds``
+    so repeated requests with a bad token are refused without calling the
+    auth server; error responses are never cached, and a 5xx or 429 from the
+    auth server yields a 503.
+
+    With ``jwks_url`` set, JWT access tokens are verified locally (signature,
+    ``exp``, and ``aud``/``iss`` when configured) and only opaque tokens or
+    tokens that fail local verification are sent to ``/introspect``. This
+    requires the ``jwt`` extra and an auth server publishing asymmetric keys.
+
+    ``batch=True`` collects introspections of distinct tokens arriving within
+    ~2 ms into a single ``/introspect/batch`` call. It helps servers with many
+    concurrent users and costs single-tenant servers a little latency.
+
+    With ``redis_url`` set, the middleware subscribes to revocations published
+    by ``AuthAgentClient(redis_url=...).revoke_token`` and evicts those tokens
+    from its cache, so revocation is immediate across workers and hosts.
+
+    How each request was authenticated is recorded as
+    ``request.state.auth_cache``: ``"hit"`` (served from the token cache),
+    ``"miss"`` (validated by the auth server or JWKS) or ``"bypass"`` (public
+    path). ``cache_status_header=True`` also returns it as an
+    ``X-Auth-Cache`` response header, plus ``X-Auth-Cache-Age`` in seconds
+    on hits, so cache effectiveness can be measured in production.
     """
 
+    __slots__ = (
+        "app",
+        "auth_server",
+        "server_id",
+        "api_key",
+        "_api_key_header",
+        "_introspect_headers",
+        "required_scopes",
+        "_required_scopes",
+        "public_paths",
+        "_public_exact",
+        "_public_prefixes",
+        "introspect_url",
+        "_unauthorized",
+        "_forbidden",
+        "_unavailable",
+        "_cache",
+        "_inflight",
+        "_pool_limits",
+        "_http",
+        "_http_loop",
+        "_batcher",
+        "_jwks",
+        "_revocation",
+        "cache_status_header",
+    )
+
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         auth_server: str = "https://mcp.auth-agent.com",
         server_id: Optional[str] = None,
         api_key: Optional[str] = None,
         required_scopes: Optional[List[str]] = None,
         public_paths: Optional[List[str]] = None,
+        cache_ttl_seconds: float = 30.0,
+        cache_max: int = 10000,
+        negative_cache_ttl_seconds: float = 10.0,
+        token_cache: Optional[TokenCache] = None,
+        jwks_url: Optional[str] = None,
+        expected_issuer: Optional[str] = None,
+        expected_audience: Optional[str] = None,
+        pool_limits: Optional[httpx.Limits] = None,
+        batch: bool = False,
+        redis_url: Optional[str] = None,
+        cache_status_header: bool = False,
     ):
-        super().__init__(app)
+        self.app = app
         self.auth_server = auth_server.rstrip('/')
         self.server_id = server_id
         self.api_key = api_key
+        # Built once and passed only to /introspect calls, not set as a client
+        # default, so the key never reaches /revoke or an external JWKS host
+        self._api_key_header = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self._introspect_headers = {**self._api_key_header, "Content-Type": "application/json"}
         self.required_scopes = required_scopes or []
+        self._required_scopes = frozenset(self.required_scopes)
         self.public_paths = public_paths or ['/health', '/']
+        self._public_exact = frozenset(p for p in self.public_paths if not p.endswith("*"))
+        self._public_prefixes = tuple(p[:-1] for p in self.public_paths if p.endswith("*"))
         self.introspect_url = f"{self.auth_server}/introspect"
+        self._unauthorized = self._build_unauthorized()
+        self._forbidden = self._build_forbidden()
+        # Fixed text: exception messages can name internal auth-server URLs
+        self._unavailable = _json_rejection(503, {"detail": "Auth server unavailable"})
+        self._cache = token_cache or TokenCache(
+            cache_ttl_seconds, cache_max, negative_cache_ttl_seconds
+        )
+        self._inflight: Dict[bytes, "asyncio.Future[Introspection]"] = {}
+        self._pool_limits = pool_limits or default_pool_limits()
+        # Opened on first use, inside the event loop it is tied to
+        self._http: Optional[httpx.AsyncClient] = None
+        self._http_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._batcher = (
+            BatchingIntrospector(
+                lambda tokens: introspect_batch(self._client(), tokens, self._api_key_header)
+            )
+            if batch
+            else None
+        )
+        self._jwks = (
+            JWKSVerifier(self._client, jwks_url, expected_issuer, expected_audience)
+            if jwks_url
+            else None
+        )
+        self._revocation = RedisRevocation(redis_url) if redis_url else None
+        self.cache_status_header = cache_status_header
 
-    async def dispatch(self, request: Request, call_next):
-        # Skip auth for public endpoints
-        if request.url.path in self.public_paths:
-            return await call_next(request)
-
-        # Extract token from Authorization header
-        auth_header = request.headers.get("Authorization", "")
-        if not auth_header.startswith("Bearer "):
-            return self._unauthorized_response(request)
-
-        token = auth_header[7:]  # Remove "Bearer "
-
-        # Validate token with Auth-Agent
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.introspect_url,
-                    headers={"Authorization": f"Bearer {self.api_key}"},
-                    json={"token": token},
-                    timeout=5.0,
-                )
-        except httpx.RequestError as e:
-            raise HTTPException(
-                status_code=503,
-                detail=f"Auth server unavailable: {str(e)}"
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            # Close the pooled auth-server connections on app shutdown
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "lifespan.shutdown.complete":
+                    await self.aclose()
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+            return
+
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if self._revocation is not None:
+            self._revocation.listen(self._cache)
+
+        rejection = await self._authenticate(scope)
+        if self.cache_status_header:
+            send = self._with_cache_status(scope, send)
+
+        if rejection is not None:
+            status, headers, body = rejection
+            await send({"type": "http.response.start", "status": status, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        await self.app(scope, receive, send)
+
+    async def aclose(self) -> None:
+        """
+        Close the pooled HTTP client used for introspection.
+
+        The middleware stays usable: a new client is opened on the next
+        request, so the app can go through another lifespan cycle.
+        """
+        if self._batcher is not None:
+            await self._batcher.aclose()
+        if self._revocation is not None:
+            await self._revocation.aclose()
+        if self._http is not None:
+            await self._http.aclose()
+
+    def _client(self) -> httpx.AsyncClient:
+        """
+        Return the pooled client for the running event loop.
+
+        Pooled connections belong to the loop that opened them, so a new
+        client is opened after aclose() or when the app is driven by another
+        loop (e.g. ``TestClient(app)`` without ``with`` runs one per request).
+        """
+        loop = asyncio.get_running_loop()
+        if self._http is None or self._http.is_closed or loop is not self._http_loop:
+            self._http = httpx.AsyncClient(
+                base_url=self.auth_server,
+                http2=True,
+                timeout=DEFAULT_TIMEOUT,
+                limits=self._pool_limits,
             )
+            self._http_loop = loop
+        return self._http
+
+    def invalidate(self, token: str) -> None:
+        """Drop any cached introspection result for a token."""
+        self._cache.invalidate(token)
+
+    def _with_cache_status(self, scope: Scope, send: Send) -> Send:
+        """Wrap ``send`` to add X-Auth-Cache headers to the response."""
+        state = scope.get("state", {})
+        auth_cache = state.get("auth_cache")
+        if auth_cache is None:
+            return send
+
+        extra_headers = [(b"x-auth-cache", auth_cache.encode())]
+        age = state.get("auth_cache_age")
+        if age is not None:
+            extra_headers.append((b"x-auth-cache-age", str(int(age)).encode()))
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), *extra_headers]}
+            await send(message)
+
+        return send_wrapper
+
+    async def _authenticate(self, scope: Scope) -> Optional[Rejection]:
+        """
+        Validate the request's bearer token.
+
+        Returns an error response to send instead of calling the app, or None
+        once the user context has been stored in ``scope["state"]``.
+        """
+        # Skip auth for public endpoints
+        path = scope["path"]
+        if path in self._public_exact or path.startswith(self._public_prefixes):
+            scope.setdefault("state", {})["auth_cache"] = "bypass"
+            return None
+
+        # Extract token from the raw Authorization header (ASGI lowercases names)
+        auth_header = b""
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                auth_header = value
+                break
+
+        # Reject malformed credentials locally, before any cache or network work
+        if auth_header[:7].lower() != b"bearer ":
+            return self._unauthorized
+
+        # Kept as bytes: hashing and the introspection body need no str
+        token_bytes = auth_header[7:]  # Remove "Bearer "
+        if len(token_bytes) > MAX_TOKEN_LENGTH or not _B64TOKEN.fullmatch(token_bytes):
+            return self._unauthorized
 
-        if response.status_code != 200:
-            return self._unauthorized_response(request)
+        # Validate token with Auth-Agent, unless a cached result is still fresh
+        cache_key = TokenCache.key(token_bytes)
+        token_data = self._cache.get(cache_key)
 
-        token_data = response.json()
+        state = scope.setdefault("state", {})
+        if token_data is not None:
+            state["auth_cache"] = "hit"
+            if self.cache_status_header:
+                state["auth_cache_age"] = self._cache.age(cache_key)
+        else:
+            state["auth_cache"] = "miss"
 
-        if not token_data.get("active"):
-            return self._unauthorized_response(request)
+        if token_data is None and self._jwks is not None and token_bytes.count(b".") == 2:
+            token_data = await self._jwks.verify(token_bytes.decode("ascii"))
+            if token_data is not None:
+                self._cache.put(cache_key, token_data)
+
+        if token_data is None:
+            try:
+                token_data = await self._introspect(cache_key, token_bytes)
+            except (httpx.HTTPError, BatchingIntrospectorClosed):
+                return self._unavailable
+
+        if not token_data.active:
+            return self._unauthorized
 
         # Check scopes
-        granted_scopes = token_data.get("scope", "").split()
-        missing_scopes = [s for s in self.required_scopes if s not in granted_scopes]
+        granted_scopes = (token_data.scope or "").split()
 
-        if missing_scopes:
-            return self._forbidden_response(request, self.required_scopes)
+        if self._required_scopes and not self._required_scopes.issubset(granted_scopes):
+            return self._forbidden
 
         # Inject user context into request state
-        request.state.user_email = token_data.get("sub")
-        request.state.scopes = granted_scopes
-        request.state.client_id = token_data.get("client_id")
-        request.state.audience = token_data.get("aud")
+        state["user_email"] = token_data.sub
+        state["scopes"] = granted_scopes
+        state["client_id"] = token_data.client_id
+        state["audience"] = token_data.aud
+
+        return None
+
+    async def _introspect(self, cache_key: bytes, token_bytes: bytes) -> Introspection:
+        """
+        Introspect a token, coalescing concurrent lookups for the same token.
 
-        response = await call_next(request)
-        return response
+        The first caller starts the request as a task; callers arriving while
+        it is in flight await the same task. Shielding keeps one cancelled
+        request (e.g. a client disconnect) from failing the others.
+        """
+        task = self._inflight.get(cache_key)
+        # A task left behind by a previous event loop can never complete here
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self._fetch_token_data(cache_key, token_bytes))
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+
+        return await asyncio.shield(task)
+
+    async def _fetch_token_data(self, cache_key: bytes, token_bytes: bytes) -> Introspection:
+        """POST the token to /introspect (or the batcher) and cache the result."""
+        if self._batcher is not None:
+            try:
+                token_data = await self._batcher.introspect(token_bytes.decode("ascii"))
+            except httpx.HTTPStatusError as e:
+                # Same rule as a single introspection: only 429/5xx mean unavailable
+                if e.response.status_code == 429 or e.response.status_code >= 500:
+                    raise
+                return INACTIVE
+        else:
+            # Safe without escaping: b64token characters never need it in JSON
+            response = await self._client().post(
+                "/introspect",
+                headers=self._introspect_headers,
+                content=b'{"token":"' + token_bytes + b'"}',
+            )
 
-    def _unauthorized_response(self, request: Request) -> JSONResponse:
-        """Return 401 Unauthorized with WWW-Authenticate header."""
+            # Only a definitive {"active": false} is cached: an outage or a
+            # rejected API key says nothing about the token itself
+            if response.status_code != 200:
+                if response.status_code == 429 or response.status_code >= 500:
+                    response.raise_for_status()
+                return INACTIVE
+
+            # A malformed body is rejected (401) but, like an error status, not cached
+            try:
+                token_data = decode_introspection(response.content)
+            except msgspec.DecodeError:
+                return INACTIVE
+
+        if token_data.active:
+            self._cache.put(cache_key, token_data)
+        else:
+            self._cache.put_invalid(cache_key)
+
+        return token_data
+
+    def _build_unauthorized(self) -> Rejection:
+        """Render the 401 Unauthorized response with WWW-Authenticate header."""
         www_authenticate = (
             f'Bearer realm="{self.server_id or "mcp-server"}"'
         )
@@ -107,21 +405,13 @@ class AuthAgentMiddleware(BaseHTTPMiddleware):
                 f'oauth-protected-resource/{self.server_id}"'
             )
 
-        return JSONResponse(
-            status_code=401,
-            content={"error": "unauthorized"},
-            headers={"WWW-Authenticate": www_authenticate}
-        )
+        return _json_rejection(401, {"error": "unauthorized"}, www_authenticate)
 
-    def _forbidden_response(
-        self,
-        request: Request,
-        required_scopes: List[str]
-    ) -> JSONResponse:
-        """Return 403 Forbidden with insufficient_scope error."""
+    def _build_forbidden(self) -> Rejection:
+        """Render the 403 Forbidden response with insufficient_scope error."""
         www_authenticate = (
             f'Bearer error="insufficient_scope", '
-            f'scope="{" ".join(required_scopes)}"'
+            f'scope="{" ".join(self.required_scopes)}"'
         )
 
         if self.server_id:
@@ -130,11 +420,11 @@ class AuthAgentMiddleware(BaseHTTPMiddleware):
                 f'oauth-protected-resource/{self.server_id}"'
             )
 
-        return JSONResponse(
-            status_code=403,
-            content={
+        return _json_rejection(
+            403,
+            {
                 "error": "insufficient_scope",
-                "required_scopes": required_scopes
+                "required_scopes": self.required_scopes
             },
-            headers={"WWW-Authenticate": www_authenticate}
+            www_authenticate,
         )
@@ -0,0 +1,87 @@
+"""
+Cross-process cache invalidation over Redis pub/sub
+"""
+
+import asyncio
+from typing import Optional
+
+from .cache import TokenCache
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover - optional dependency
+    aioredis = None  # type: ignore[assignment]
+
+REVOCATION_CHANNEL = "auth-agent:revoke"
+
+
+class RedisRevocation:
+    """
+    Broadcast token revocations to every worker's in-process cache.
+
+    ``AuthAgentClient.revoke_token`` publishes the SHA-256 of a revoked token
+    on ``channel``; each ``AuthAgentMiddleware`` subscribes and drops the
+    matching entry from its ``TokenCache``, closing the revocation window
+    left by caching. Raw tokens are never sent to Redis.
+
+    If the subscription drops, the local cache is cleared on reconnect since
+    revocations may have been missed in between.
+
+    Requires the ``redis`` extra: ``pip install auth-agent-mcp[redis]``.
+    """
+
+    def __init__(self, redis_url: str, channel: str = REVOCATION_CHANNEL):
+        if aioredis is None:
+            raise ImportError(
+                "Redis revocation requires redis: pip install auth-agent-mcp[redis]"
+            )
+
+        self.redis_url = redis_url
+        self.channel = channel
+        self._redis: Optional["aioredis.Redis"] = None
+        self._listener: Optional["asyncio.Task[None]"] = None
+
+    async def publish(self, token: str) -> None:
+        """Tell every subscribed worker to forget a token."""
+        await self._client().publish(self.channel, TokenCache.key(token).hex())
+
+    def listen(self, cache: TokenCache) -> None:
+        """Start evicting revoked tokens from ``cache`` (idempotent)."""
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.ensure_future(self._run(cache))
+
+    async def aclose(self) -> None:
+        """Stop listening and close the Redis connection."""
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    def _client(self) -> "aioredis.Redis":
+        # Opened lazily, and reopened after aclose() for the next lifespan cycle
+        if self._redis is None:
+            self._redis = aioredis.from_url(self.redis_url)
+        return self._redis
+
+    async def _run(self, cache: TokenCache) -> None:
+        reconnecting = False
+        while True:
+            try:
+                async with self._client().pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    if reconnecting:
+                        cache.clear()
+
+                    async for message in pubsub.listen():
+                        if message["type"] != "message":
+                            continue
+                        try:
+                            cache.pop(bytes.fromhex(message["data"].decode()))
+                        except (AttributeError, ValueError):
+                            continue
+            except aioredis.RedisError:
+                await asyncio.sleep(1.0)
+
+            reconnecting = True
@@ -34,11 +34,22 @@ setup(
     ],
     python_requires=">=3.8",
     install_requires=[
-        "httpx>=0.25.0",
+        "httpx[http2]>=0.25.0",
+        "msgspec>=0.18.0",
         "fastapi>=0.104.0",
         "starlette>=0.27.0",
     ],
     extras_require={
+        "redis": [
+            "redis>=5.0.1",
+        ],
+        "fast": [
+            "uvloop>=0.19.0; platform_system != 'Windows'",
+            "httptools>=0.6.0",
+        ],
+        "jwt": [
+            "PyJWT[crypto]>=2.8.0",
+        ],
         "dev": [
             "pytest>=7.0.0",
             "pytest-asyncio>=0.21.0",
@@ -0,0 +1,72 @@
+"""
+Tests for AuthAgentMiddleware against a local auth server
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from auth_agent_mcp import AuthAgentMiddleware
+
+
+class _IntrospectionHandler(BaseHTTPRequestHandler):
+    """Report every token active, for /introspect and /introspect/batch."""
+
+    # Keep-alive, so the middleware reuses pooled connections between requests
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        token_data = {"active": True, "sub": "user@example.com", "scope": "files:read"}
+        if "tokens" in request:
+            content = {"results": [token_data] * len(request["tokens"])}
+        else:
+            content = token_data
+
+        body = json.dumps(content).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def auth_server() -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _IntrospectionHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("batch", [False, True])
+def test_introspects_from_a_new_event_loop_per_request(auth_server: str, batch: bool) -> None:
+    app = FastAPI()
+    app.add_middleware(
+        AuthAgentMiddleware,
+        auth_server=auth_server,
+        api_key="sk_test",
+        cache_ttl_seconds=0,
+        batch=batch,
+    )
+
+    @app.get("/files")
+    async def files(request: Request) -> dict:
+        return {"user": request.state.user_email}
+
+    # Without ``with``, TestClient runs each request in its own event loop
+    client = TestClient(app)
+    for i in range(3):
+        response = client.get("/files", headers={"Authorization": f"Bearer token{i}"})
+        assert response.status_code == 200
+        assert response.json() == {"user": "user@example.com"}
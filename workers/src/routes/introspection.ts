@@ -8,65 +8,55 @@ import { Hono } from 'hono';
 import type { Env } from '../index';
 import { Database } from '../lib/db';
 import { verifyJWT, verifySecret } from '../lib/crypto';
+import type { IntrospectionResponse } from '../types';
 
 const app = new Hono<{ Bindings: Env }>();
 
+const MAX_BATCH_SIZE = 100;
+
 // ============================================================================
 // TOKEN INTROSPECTION (RFC 7662)
 // ============================================================================
 
-app.post('/introspect', async (c) => {
-  // Authenticate the caller (MCP server with API key)
-  const authHeader = c.req.header('Authorization');
-  if (!authHeader?.startsWith('Bearer ')) {
-    return c.json({ error: 'invalid_client', error_description: 'Missing API key' }, 401);
-  }
-
-  const apiKey = authHeader.substring(7);
-  const { token } = await c.req.json();
-
-  if (!token) {
-    return c.json({ active: false });
-  }
-
-  const db = new Database(c.env.SUPABASE_URL, c.env.SUPABASE_SERVICE_KEY);
-
-  // Validate API key - MUST be a valid server key
-  const serverKey = await db.getServerKeyBySecret(apiKey);
-  if (!serverKey) {
-    return c.json({ error: 'invalid_client', error_description: 'Invalid API key' }, 401);
+/**
+ * Introspect a single access token after the caller has been authenticated
+ */
+async function introspectToken(
+  db: Database,
+  token: unknown,
+  jwtSecret: string
+): Promise<IntrospectionResponse> {
+  if (!token || typeof token !== 'string') {
+    return { active: false };
   }
 
-  // Update last_used_at for the key
-  await db.updateServerKeyLastUsed(serverKey.key_id);
-
   // Verify JWT
-  const decoded = await verifyJWT(token, c.env.JWT_SECRET);
+  const decoded = await verifyJWT(token, jwtSecret);
   if (!decoded) {
-    return c.json({ active: false });
+    return { active: false };
   }
 
   // Check if token is revoked in database
   const tokenRecord = await db.getTokenByAccessToken(token);
 
   if (!tokenRecord || tokenRecord.revoked) {
-    return c.json({ active: false });
+    return { active: false };
   }
 
   // Check expiration
   if (tokenRecord.access_token_expires_at < new Date()) {
-    return c.json({ active: false });
+    return { active: false };
   }
 
   // Optionally: Check if token audience matches the server making the request
   // This ensures servers can only introspect tokens meant for them
   // const server = await db.getMcpServer(serverKey.server_id);
   // if (server && decoded.aud !== server.server_url) {
-  //   return c.json({ active: false });  // Token not for this server
+  //   return { active: false };  // Token not for this server
   // }
 
   // Return token info
-  return c.json({
+  return {
     active: true,
     sub: decoded.sub,
     client_id: decoded.client_id,
@@ -74,7 +64,75 @@ app.post('/introspect', async (c) => {
     aud: decoded.aud,  // RFC 8707 audience
     exp: decoded.exp,
     iat: decoded.iat,
-  });
+  };
+}
+
+/**
+ * Authenticate the caller (MCP server with API key)
+ */
+async function authenticateServer(db: Database, apiKey: string): Promise<boolean> {
+  // Validate API key - MUST be a valid server key
+  const serverKey = await db.getServerKeyBySecret(apiKey);
+  if (!serverKey) {
+    return false;
+  }
+
+  // Update last_used_at for the key
+  await db.updateServerKeyLastUsed(serverKey.key_id);
+
+  return true;
+}
+
+app.post('/introspect', async (c) => {
+  // Authenticate the caller (MCP server with API key)
+  const authHeader = c.req.header('Authorization');
+  if (!authHeader?.startsWith('Bearer ')) {
+    return c.json({ error: 'invalid_client', error_description: 'Missing API key' }, 401);
+  }
+
+  const { token } = await c.req.json();
+
+  if (!token) {
+    return c.json({ active: false });
+  }
+
+  const db = new Database(c.env.SUPABASE_URL, c.env.SUPABASE_SERVICE_KEY);
+
+  if (!(await authenticateServer(db, authHeader.substring(7)))) {
+    return c.json({ error: 'invalid_client', error_description: 'Invalid API key' }, 401);
+  }
+
+  return c.json(await introspectToken(db, token, c.env.JWT_SECRET));
+});
+
+// Batch introspection: one API key check for many tokens.
+// Body: { tokens: string[] } -> { results: IntrospectionResponse[] } (same order)
+app.post('/introspect/batch', async (c) => {
+  const authHeader = c.req.header('Authorization');
+  if (!authHeader?.startsWith('Bearer ')) {
+    return c.json({ error: 'invalid_client', error_description: 'Missing API key' }, 401);
+  }
+
+  const { tokens } = await c.req.json();
+
+  if (!Array.isArray(tokens) || tokens.length > MAX_BATCH_SIZE) {
+    return c.json({
+      error: 'invalid_request',
+      error_description: `tokens must be an array of at most ${MAX_BATCH_SIZE} tokens`,
+    }, 400);
+  }
+
+  const db = new Database(c.env.SUPABASE_URL, c.env.SUPABASE_SERVICE_KEY);
+
+  if (!(await authenticateServer(db, authHeader.substring(7)))) {
+    return c.json({ error: 'invalid_client', error_description: 'Invalid API key' }, 401);
+  }
+
+  const results = await Promise.all(
+    tokens.map((token: unknown) => introspectToken(db, token, c.env.JWT_SECRET))
+  );
+
+  return c.json({ results });
 });
 
 // ============================================================================